@@ -16,11 +16,17 @@ except ImportError:
     YANDEX_FOLDER_ID = "YOUR_YANDEX_FOLDER_ID"
     YANDEX_AUTH_TOKEN = "YOUR_YANDEX_AUTH_TOKEN"
 
+# Webhook port from environment; malformed values fall back to 8080
+_webhook_port = os.getenv('WEBHOOK_PORT', '8080').strip()
+
 # Telegram Bot Configuration
 TELEGRAM_CONFIG = {
     'token': os.getenv('TELEGRAM_BOT_TOKEN', TELEGRAM_BOT_TOKEN),
     'webhook_url': os.getenv('WEBHOOK_URL', ''),
     'use_webhook': os.getenv('USE_WEBHOOK', 'false').lower() == 'true',
+    'webhook_host': os.getenv('WEBHOOK_HOST', '0.0.0.0'),
+    'webhook_port': int(_webhook_port) if _webhook_port.isdigit() else 8080,
+    'webhook_secret': os.getenv('WEBHOOK_SECRET', ''),
     'max_message_length': 4000,
     'timeout': 30
 }
@@ -34,12 +40,17 @@ YANDEX_CONFIG = {
     'max_tokens': 2000
 }
 
+# Log level from environment; unknown names fall back to INFO
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+_log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+
 # Bot Behavior Configuration
 BOT_CONFIG = {
     'response_timeout': 30,
     'max_retries': 3,
     'retry_delay': 2,
-    'log_level': 'INFO',
+    'max_retry_delay': 60,
+    'log_level': _log_level if _log_level in LOG_LEVELS else 'INFO',
     'log_file': 'telegram_bot.log',
     'conversation_cache_size': 1000,
     'conversation_timeout': 3600  # 1 hour
@@ -125,6 +136,9 @@ def validate_config() -> Dict[str, Any]:
     if not TELEGRAM_CONFIG['token'] or TELEGRAM_CONFIG['token'] == 'YOUR_TELEGRAM_TOKEN':
         issues.append("Telegram bot token not configured")
     
+    if TELEGRAM_CONFIG['use_webhook'] and not TELEGRAM_CONFIG['webhook_url']:
+        issues.append("Webhook mode enabled but WEBHOOK_URL not configured")
+    
     # Check YandexGPT credentials
     if not YANDEX_CONFIG['folder_id'] or YANDEX_CONFIG['folder_id'] == 'YOUR_FOLDER_ID':
         issues.append("YandexGPT folder_id not configured")
@@ -144,6 +158,7 @@ Bot Configuration:
 - Telegram Token: {'✓ Set' if TELEGRAM_CONFIG['token'] else '✗ Missing'}
 - YandexGPT Folder ID: {'✓ Set' if YANDEX_CONFIG['folder_id'] else '✗ Missing'}
 - YandexGPT Auth Token: {'✓ Set' if YANDEX_CONFIG['auth_token'] else '✗ Missing'}
+- Mode: {'webhook' if TELEGRAM_CONFIG['use_webhook'] else 'polling'}
 - Log Level: {BOT_CONFIG['log_level']}
 - Max Message Length: {TELEGRAM_CONFIG['max_message_length']}
 - Model Temperature: {YANDEX_CONFIG['temperature']}
@@ -15,14 +15,14 @@ load_dotenv()
 # Добавляем текущую директорию в путь для импорта модулей
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from telegram_bot import main
-
 if __name__ == "__main__":
     try:
         print("🤖 Запуск ITMO Curriculum Bot...")
         print("Для остановки нажмите Ctrl+C")
         print("-" * 50)
         
+        # Импортируем бота после вывода баннера: загрузка зависимостей занимает время
+        from telegram_bot import main
         main()
         
     except KeyboardInterrupt:
@@ -1,50 +1,132 @@
-import requests
-import json
-from bs4 import BeautifulSoup
+import os
+import aiohttp
+import asyncio
+import orjson
 import re
 import sys
 import argparse
 from urllib.parse import urlparse
 
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+
+# Данные страницы Next.js лежат в <script id="__NEXT_DATA__">,
+# достаем их напрямую без построения DOM
+_NEXT_DATA_RE = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+_BR_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<.*?>', re.DOTALL)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Локальный кэш HTTP-ответов (SQLite), чтобы повторные запуски не ходили в сеть
+CACHE_NAME = 'itmo_cache.sqlite'
+CACHE_EXPIRE_SECONDS = 3600
+
+# Кэш уже распарсенных программ: при 304 Not Modified страница не парсится заново
+PROGRAM_CACHE_DIR = 'cache'
+
+def load_cached_program(program_id: str):
+    path = os.path.join(PROGRAM_CACHE_DIR, f'{program_id}.json')
+    try:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (IOError, orjson.JSONDecodeError) as e:
+        print(f"Error reading cache file {path}: {e}")
+        return None
+
+def save_cached_program(program_id: str, url: str, etag, last_modified, data: dict):
+    path = os.path.join(PROGRAM_CACHE_DIR, f'{program_id}.json')
+    entry = {
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "data": data,
+    }
+    try:
+        os.makedirs(PROGRAM_CACHE_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(entry))
+    except IOError as e:
+        print(f"Error saving cache file {e}")
+
+def dig(d, *path, default=None):
+    """Достать значение по вложенному пути ключей, не создавая промежуточных {}"""
+    for key in path:
+        d = d.get(key) if isinstance(d, dict) else None
+        if d is None:
+            return default
+    return d
+
 def clean_html_tags(text):
     if not text:
         return ""
-    clean_text = re.sub(r'<br\s*/?>', '\n', text)
-    clean_text = re.sub(r'<.*?>', '', clean_text)
-    return clean_text.strip()
+    return _TAG_RE.sub('', _BR_RE.sub('\n', text)).strip()
 
-def parse_itmo_program(url: str):
+async def _fetch_page(session: aiohttp.ClientSession, url: str, cached: dict = None):
+    """Вернуть (html, etag, last_modified); html равен None, если страница не изменилась"""
     print(f"requesting: {url}")
     
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and cached:
+                return None, cached.get('etag'), cached.get('last_modified')
+            response.raise_for_status()
+            if getattr(response, 'from_cache', False):
+                print(f"Page loaded from cache: {url}")
+            html = await response.text()
+            return html, response.headers.get('ETag'), response.headers.get('Last-Modified')
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(e)
         return None
 
-    print("Page loaded, parsing...")
-    
-    soup = BeautifulSoup(response.text, 'html.parser')
+
+async def fetch_all(urls, cached_entries=None, use_http_cache=True):
+    if cached_entries is None:
+        cached_entries = [None] * len(urls)
     
-    next_data_script = soup.find('script', {'id': '__NEXT_DATA__'})
+    async with aiohttp.ClientSession(headers=HEADERS) as plain_session:
+        if not use_http_cache:
+            return await asyncio.gather(*[
+                _fetch_page(plain_session, url, cached) for url, cached in zip(urls, cached_entries)
+            ])
+        
+        cache = SQLiteBackend(cache_name=CACHE_NAME, expire_after=CACHE_EXPIRE_SECONDS)
+        async with CachedSession(cache=cache, headers=HEADERS) as cached_session:
+            # Условные запросы идут мимо SQLite-кэша: иначе он сам ответит 200,
+            # If-None-Match/If-Modified-Since не дойдут до сервера и страницу придется парсить заново
+            return await asyncio.gather(*[
+                _fetch_page(plain_session if cached else cached_session, url, cached)
+                for url, cached in zip(urls, cached_entries)
+            ])
+
+
+def parse_program_page(html: str, url: str):
+    next_data_match = _NEXT_DATA_RE.search(html)
     
     try:
-        if next_data_script:
-            script_content = next_data_script.get_text()
-            if script_content:
-                data = json.loads(script_content)
-                page_props = data.get('props', {}).get('pageProps', {})
+        if next_data_match:
+            script_content = next_data_match.group(1)
+            if script_content.strip():
+                data = orjson.loads(script_content)
+                page_props = dig(data, 'props', 'pageProps', default={})
             else:
                 print("Script content is empty")
                 return None
         else:
             print("Could not find __NEXT_DATA__ script")
             return None
-    except (json.JSONDecodeError, AttributeError) as e:
+    except (orjson.JSONDecodeError, AttributeError) as e:
         print(f"Error parsing JSON data: {e}")
         return None
 
@@ -76,27 +158,29 @@ def parse_itmo_program(url: str):
         
         teaching_staff.append(staff_member)
     
+    faculty = (api_program.get('faculties') or [{}])[0]
+    
     program_info = {
         "program_name": api_program.get('title'),
         "page_url": url,
         "faculty": {
-            "name": api_program.get('faculties', [{}])[0].get('title'),
-            "link": api_program.get('faculties', [{}])[0].get('link'),
+            "name": faculty.get('title'),
+            "link": faculty.get('link'),
         },
         "description": {
-            "short": clean_html_tags(json_program.get('about', {}).get('lead')),
-            "full": clean_html_tags(json_program.get('about', {}).get('desc')),
+            "short": clean_html_tags(dig(json_program, 'about', 'lead')),
+            "full": clean_html_tags(dig(json_program, 'about', 'desc')),
         },
         "main_parameters": {
-            "study_format": api_program.get('study', {}).get('mode'),
-            "duration": api_program.get('study', {}).get('label'),
+            "study_format": dig(api_program, 'study', 'mode'),
+            "duration": dig(api_program, 'study', 'label'),
             "language": api_program.get('language'),
-            "tuition_fee_rub_per_year": api_program.get('educationCost', {}).get('russian'),
+            "tuition_fee_rub_per_year": dig(api_program, 'educationCost', 'russian'),
             "state_accreditation": api_program.get('hasAccreditation'),
             "military_training_center": api_program.get('isMilitary'),
             "additional_options": api_program.get('type'),
         },
-        "career_prospects": clean_html_tags(json_program.get('career', {}).get('lead')),
+        "career_prospects": clean_html_tags(dig(json_program, 'career', 'lead')),
         "program_manager": {
             "name": f"{supervisor_data.get('firstName')} {supervisor_data.get('lastName')}",
             "middle_name": supervisor_data.get('middleName'),
@@ -111,8 +195,8 @@ def parse_itmo_program(url: str):
                 } for pos in supervisor_data.get('positions', [])
             ],
             "contacts": {
-                "email": json_program.get('supervisor', {}).get('email'),
-                "phone": json_program.get('supervisor', {}).get('phone'),
+                "email": dig(json_program, 'supervisor', 'email'),
+                "phone": dig(json_program, 'supervisor', 'phone'),
             }
         },
         "teaching_staff": teaching_staff,
@@ -122,9 +206,9 @@ def parse_itmo_program(url: str):
                 "code": direction.get("code"),
                 "name": direction.get("title"),
                 "admission_quotas": {
-                    "budget_funded": direction.get("admission_quotas", {}).get("budget"),
-                    "fee_based": direction.get("admission_quotas", {}).get("contract"),
-                    "targeted": direction.get("admission_quotas", {}).get("target_reception"),
+                    "budget_funded": dig(direction, "admission_quotas", "budget"),
+                    "fee_based": dig(direction, "admission_quotas", "contract"),
+                    "targeted": dig(direction, "admission_quotas", "target_reception"),
                 }
             } for direction in api_program.get('directions', [])
         ],
@@ -135,6 +219,16 @@ def parse_itmo_program(url: str):
     return program_info
 
 
+def parse_itmo_program(url: str):
+    page = asyncio.run(fetch_all([url]))[0]
+    if page is None:
+        return None
+    html, *_ = page
+    if html is None:
+        return None
+    return parse_program_page(html, url)
+
+
 def extract_program_id_from_url(url: str) -> str:
     try:
         parsed_url = urlparse(url)
@@ -153,35 +247,62 @@ def save_to_json(data: dict, filename: str):
         return
     
     try:
-        with open(f'results/{filename}', 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        with open(f'results/{filename}', 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"Saved to file: {filename}")
     except IOError as e:
         print(f"Error saving file {e}")
 
 def main():
-    parser = argparse.ArgumentParser(description='Parse ITMO program data from URL')
-    parser.add_argument('url', nargs='?',
-                       default="https://abit.itmo.ru/program/master/ai_product",
-                       help='URL of the ITMO program page to parse')
+    parser = argparse.ArgumentParser(description='Parse ITMO program data from URLs')
+    parser.add_argument('urls', nargs='*',
+                       default=["https://abit.itmo.ru/program/master/ai",
+                                "https://abit.itmo.ru/program/master/ai_product"],
+                       help='URLs of the ITMO program pages to parse')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore HTTP and program caches and download pages again')
     
     args = parser.parse_args()
-    url = args.url
+    urls = args.urls
+    program_ids = [extract_program_id_from_url(url) for url in urls]
     
-    program_id = extract_program_id_from_url(url)
-    output_filename = f"itmo_program_data_{program_id}.json"
+    cached_entries = [None] * len(urls)
+    if not args.no_cache:
+        for i, (url, program_id) in enumerate(zip(urls, program_ids)):
+            cached = load_cached_program(program_id)
+            if cached and cached.get('url') == url:
+                cached_entries[i] = cached
     
-    print(f"Parsing URL: {url}")
-    print(f"Output file: {output_filename}")
+    # Загружаем все страницы параллельно, парсим после получения
+    pages = asyncio.run(fetch_all(urls, cached_entries, use_http_cache=not args.no_cache))
     
-    parsed_data = parse_itmo_program(url)
+    failed = False
+    for url, program_id, cached, page in zip(urls, program_ids, cached_entries, pages):
+        output_filename = f"itmo_program_data_{program_id}.json"
+        
+        print(f"Parsing URL: {url}")
+        print(f"Output file: {output_filename}")
+        
+        parsed_data = None
+        if page is not None:
+            html, etag, last_modified = page
+            if html is None:
+                print("Page not modified, using cached data")
+                parsed_data = cached['data']
+            else:
+                parsed_data = parse_program_page(html, url)
+                if parsed_data and (etag or last_modified):
+                    save_cached_program(program_id, url, etag, last_modified, parsed_data)
+        
+        if parsed_data:
+            save_to_json(parsed_data, output_filename)
+        else:
+            print(f"Failed to parse program data: {url}")
+            failed = True
     
-    if parsed_data:
-        save_to_json(parsed_data, output_filename)
-    else:
-        print("Failed to parse program data")
+    if failed:
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
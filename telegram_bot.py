@@ -5,16 +5,20 @@ Telegram bot for ITMO curriculum Q&A using YandexGPT
 """
 
 import os
+import re
 import json
 import logging
 import asyncio
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
+from dataclasses import dataclass
 from datetime import datetime
+from urllib.parse import urlparse
 
-import requests
-from yandex_cloud_ml_sdk import YCloudML
+import aiohttp
+import orjson
+from aiohttp import web
+from cachetools import TTLCache
 
-from pdf_processor import PDFProcessor
 from bot_config import (
     TELEGRAM_CONFIG, YANDEX_CONFIG, BOT_CONFIG, SYSTEM_PROMPTS,
     validate_config, get_config_summary
@@ -31,6 +35,126 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Регулярное выражение для перевода markdown в HTML для Telegram за один проход:
+# ```блок кода```, `код`, ***жирный курсив***, **жирный**, *курсив*
+_MARKDOWN_RE = re.compile(
+    r'```((?s:.*?))```'
+    r'|`([^`]+?)`'
+    r'|\*\*\*([^*]+?)\*\*\*'
+    r'|\*\*(.*?)\*\*'
+    r'|(?<!\*)\*([^*]+?)\*(?!\*)'
+)
+
+
+def _markdown_to_html(match: re.Match) -> str:
+    """Заменить найденный markdown-фрагмент на HTML-тег"""
+    code_block, code, bold_italic, bold, italic = match.groups()
+    if code_block is not None:
+        return f'<code>{code_block}</code>'
+    if code is not None:
+        return f'<code>{code}</code>'
+    if bold_italic is not None:
+        return f'<b><i>{bold_italic}</i></b>'
+    if bold is not None:
+        # Внутри жирного текста может быть курсив или код
+        return f'<b>{_MARKDOWN_RE.sub(_markdown_to_html, bold)}</b>'
+    return f'<i>{italic}</i>'
+
+@dataclass
+class IncomingMessage:
+    """Нужные боту поля входящего сообщения Telegram"""
+    __slots__ = ('chat_id', 'user_id', 'text')
+    
+    chat_id: int
+    user_id: int
+    text: str
+    
+    @classmethod
+    def from_message(cls, message: Dict) -> 'IncomingMessage':
+        """Извлечь поля из объекта message Telegram API"""
+        return cls(
+            chat_id=message['chat']['id'],
+            user_id=message['from']['id'],
+            text=(message.get('text') or '').strip()
+        )
+
+# Теги Telegram HTML, которые нужно закрывать/переоткрывать на границе частей
+_HTML_TAG_RE = re.compile(r'<(/?)(b|i|u|s|code|pre)>')
+
+
+def _cut_text(text: str, max_length: int) -> List[str]:
+    """Нарезать текст кусками по max_length, не разрезая HTML-теги <...>"""
+    parts = []
+    start = 0
+    while len(text) - start > max_length:
+        end = start + max_length
+        # Если разрез попадает внутрь тега, переносим его на начало тега
+        tag_start = text.rfind('<', start, end)
+        if tag_start > start and text.find('>', tag_start, end) == -1:
+            end = tag_start
+        parts.append(text[start:end])
+        start = end
+    parts.append(text[start:])
+    return parts
+
+
+def _split_text(text: str, max_length: int, separators=('\n\n', '\n', ' ')) -> List[str]:
+    """Разбить текст на части не длиннее max_length по границам абзацев, строк и слов"""
+    if len(text) <= max_length:
+        return [text]
+    if not separators:
+        return _cut_text(text, max_length)
+    
+    separator, finer_separators = separators[0], separators[1:]
+    parts = []
+    current = ''
+    for piece in text.split(separator):
+        candidate = f'{current}{separator}{piece}' if current else piece
+        if len(candidate) <= max_length:
+            current = candidate
+            continue
+        if current:
+            parts.append(current)
+        if len(piece) <= max_length:
+            current = piece
+        else:
+            # Слишком длинный фрагмент делим по более мелким границам
+            # (фрагмент из одних пробелов дает пустой список)
+            chunks = _split_text(piece, max_length, finer_separators)
+            current = chunks.pop() if chunks else ''
+            parts.extend(chunks)
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_message(text: str, max_length: int) -> List[str]:
+    """Разбить сообщение на части, сохраняя корректную HTML-разметку в каждой.
+    
+    Теги, открытые в конце части, закрываются в ней и открываются заново
+    в начале следующей, иначе Telegram отклоняет часть с parse_mode=HTML.
+    Добавленные теги могут немного превысить max_length, поэтому
+    max_message_length оставляет запас до лимита Telegram.
+    
+    >>> split_message('abc <b>' + 'q' * 15 + '</b>', 20)
+    ['abc', '<b>qqqqqqqqqqqqqqq</b>']
+    """
+    parts = []
+    open_tags = []
+    for part in _split_text(text, max_length):
+        prefix = ''.join(f'<{tag}>' for tag in open_tags)
+        for closing, tag in _HTML_TAG_RE.findall(part):
+            if not closing:
+                open_tags.append(tag)
+            elif tag in open_tags:
+                del open_tags[len(open_tags) - 1 - open_tags[::-1].index(tag)]
+        # Часть из одних тегов Telegram отклонит как пустое сообщение
+        if not _HTML_TAG_RE.sub('', part).strip():
+            continue
+        suffix = ''.join(f'</{tag}>' for tag in reversed(open_tags))
+        parts.append(f'{prefix}{part}{suffix}')
+    return parts
+
 class ITMOCurriculumBot:
     """Telegram bot for ITMO curriculum questions"""
     
@@ -47,10 +171,29 @@ class ITMOCurriculumBot:
         self.telegram_token = TELEGRAM_CONFIG['token']
         self.yandex_folder_id = YANDEX_CONFIG['folder_id']
         self.yandex_auth_token = YANDEX_CONFIG['auth_token']
+        self._base_url = f'https://api.telegram.org/bot{self.telegram_token}'
+        
+        # HTTP-сессия для Telegram API: переиспользует соединения (keep-alive).
+        # Создается в run(), так как aiohttp требует запущенного event loop
+        self.http: Optional[aiohttp.ClientSession] = None
+        
+        # Задачи обработки вопросов, выполняющиеся параллельно
+        self._tasks: Set[asyncio.Task] = set()
+        
+        # Тяжелые зависимости импортируем только при создании бота,
+        # чтобы не замедлять импорт модуля
+        from pdf_processor import PDFProcessor
+        from yandex_cloud_ml_sdk import YCloudML
         
         # Инициализация процессора PDF
         self.pdf_processor = PDFProcessor()
         
+        # Учебные планы не меняются за время работы процесса,
+        # поэтому системный промпт собираем один раз
+        self._system_prompt = SYSTEM_PROMPTS['main'].format(
+            curriculum_text=self.pdf_processor.get_curriculum_text()
+        )
+        
         # Инициализация YandexGPT SDK
         self.yandex_sdk = YCloudML(
             folder_id=self.yandex_folder_id,
@@ -60,16 +203,18 @@ class ITMOCurriculumBot:
         # Offset для получения обновлений
         self.update_offset = 0
         
-        # Кэш для хранения контекста разговоров
-        self.conversation_cache = {}
+        # Кэш для хранения контекста разговоров (ограничен по размеру и времени жизни)
+        self.conversation_cache = TTLCache(
+            maxsize=BOT_CONFIG['conversation_cache_size'],
+            ttl=BOT_CONFIG['conversation_timeout']
+        )
         
         logger.info("ITMO Curriculum Bot initialized")
         logger.info(get_config_summary())
     
     def get_system_prompt(self) -> str:
         """Получить системный промпт с учебными планами"""
-        curriculum_text = self.pdf_processor.get_curriculum_text()
-        return SYSTEM_PROMPTS['main'].format(curriculum_text=curriculum_text)
+        return self._system_prompt
     
     def create_messages_for_yandex(self, user_question: str) -> List[Dict]:
         """Создать сообщения для YandexGPT API"""
@@ -95,34 +240,26 @@ class ITMOCurriculumBot:
             
             logger.info(f"Sending request to YandexGPT for question: {user_question[:100]}...")
             
-            # ОТЛАДОЧНЫЙ ВЫВОД: печатаем системный промпт
+            # Отладочный вывод: системный промпт и вопрос пользователя (только при уровне DEBUG)
             system_message = messages[0] if messages and messages[0].get('role') == 'system' else None
             if system_message:
-                print("\n" + "="*80)
-                print("СИСТЕМНЫЙ ПРОМПТ, ОТПРАВЛЯЕМЫЙ В YANDEXGPT:")
-                print("="*80)
-                print(system_message['text'])
-                print("="*80)
-                print(f"Длина системного промпта: {len(system_message['text'])} символов")
-                print("="*80 + "\n")
+                logger.debug("System prompt (%d chars): %s", len(system_message['text']), system_message['text'])
             
-            # ОТЛАДОЧНЫЙ ВЫВОД: печатаем вопрос пользователя
             user_message = messages[1] if len(messages) > 1 and messages[1].get('role') == 'user' else None
             if user_message:
-                print("ВОПРОС ПОЛЬЗОВАТЕЛЯ:")
-                print("-" * 40)
-                print(user_message['text'])
-                print("-" * 40 + "\n")
+                logger.debug("User question: %s", user_message['text'])
             
-            # Вызов YandexGPT
-            result = (
+            # Вызов YandexGPT (синхронный SDK выполняем в отдельном потоке,
+            # чтобы не блокировать event loop)
+            model = (
                 self.yandex_sdk.models.completions(YANDEX_CONFIG['model_name'])
                 .configure(
                     temperature=YANDEX_CONFIG['temperature'],
                     max_tokens=YANDEX_CONFIG['max_tokens']
                 )
-                .run(messages)
             )
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, model.run, messages)
             
             if result and len(result) > 0:
                 response_text = result[0].text if hasattr(result[0], 'text') else str(result[0])
@@ -140,43 +277,31 @@ class ITMOCurriculumBot:
     
     def fix_telegram_formatting(self, text: str) -> str:
         """Исправить форматирование для Telegram"""
-        import re
-        
-        # Заменяем markdown форматирование на HTML
-        # **жирный** -> <b>жирный</b>
-        text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-        
-        # *курсив* -> <i>курсив</i>
-        text = re.sub(r'(?<!\*)\*([^*]+?)\*(?!\*)', r'<i>\1</i>', text)
-        
-        # ```код``` -> <code>код</code>
-        text = re.sub(r'```(.*?)```', r'<code>\1</code>', text, flags=re.DOTALL)
-        
-        # `код` -> <code>код</code>
-        text = re.sub(r'`([^`]+?)`', r'<code>\1</code>', text)
+        # Заменяем markdown форматирование на HTML одним проходом по тексту
+        text = _MARKDOWN_RE.sub(_markdown_to_html, text)
         
         return text
     
-    def send_telegram_message(self, chat_id: int, text: str) -> bool:
+    async def send_telegram_message(self, chat_id: int, text: str) -> bool:
         """Отправить сообщение в Telegram"""
-        url = f'https://api.telegram.org/bot{self.telegram_token}/sendMessage'
+        url = f'{self._base_url}/sendMessage'
         
         # Разбиваем длинные сообщения
         max_length = TELEGRAM_CONFIG['max_message_length']
         if len(text) > max_length:
-            parts = [text[i:i+max_length] for i in range(0, len(text), max_length)]
+            parts = split_message(text, max_length)
+            total = len(parts)
             for i, part in enumerate(parts):
-                if i > 0:
-                    part = f"(продолжение {i+1}/{len(parts)})\n\n" + part
                 payload = {
                     'chat_id': chat_id,
-                    'text': part,
+                    'text': f"(продолжение {i+1}/{total})\n\n{part}" if i else part,
                     'parse_mode': 'HTML'
                 }
                 try:
-                    response = requests.post(url, data=payload, timeout=10)
-                    if not response.json().get('ok'):
-                        logger.error(f"Failed to send message part {i+1}: {response.text}")
+                    async with self.http.post(url, data=payload, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                        result = orjson.loads(await response.read())
+                    if not result.get('ok'):
+                        logger.error(f"Failed to send message part {i+1}: {result}")
                         return False
                 except Exception as e:
                     logger.error(f"Error sending message part {i+1}: {e}")
@@ -189,8 +314,8 @@ class ITMOCurriculumBot:
                 'parse_mode': 'HTML'
             }
             try:
-                response = requests.post(url, data=payload, timeout=10)
-                result = response.json()
+                async with self.http.post(url, data=payload, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    result = orjson.loads(await response.read())
                 if result.get('ok'):
                     return True
                 else:
@@ -200,9 +325,9 @@ class ITMOCurriculumBot:
                 logger.error(f"Error sending message: {e}")
                 return False
     
-    def get_telegram_updates(self) -> List[Dict]:
-        """Получить обновления из Telegram"""
-        url = f'https://api.telegram.org/bot{self.telegram_token}/getUpdates'
+    async def get_telegram_updates(self) -> Optional[List[Dict]]:
+        """Получить обновления из Telegram (None при ошибке)"""
+        url = f'{self._base_url}/getUpdates'
         params = {
             'offset': self.update_offset,
             'timeout': TELEGRAM_CONFIG['timeout'],
@@ -210,29 +335,30 @@ class ITMOCurriculumBot:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=TELEGRAM_CONFIG['timeout'] + 5)
-            data = response.json()
+            timeout = aiohttp.ClientTimeout(total=TELEGRAM_CONFIG['timeout'] + 5)
+            async with self.http.get(url, params=params, timeout=timeout) as response:
+                data = orjson.loads(await response.read())
             
-            if data.get('ok') and data.get('result'):
-                updates = data['result']
+            if data.get('ok'):
+                updates = data.get('result') or []
                 if updates:
                     # Обновляем offset
                     self.update_offset = updates[-1]['update_id'] + 1
                 return updates
             else:
                 logger.error(f"Error getting updates: {data}")
-                return []
+                return None
                 
         except Exception as e:
             logger.error(f"Error getting Telegram updates: {e}")
-            return []
+            return None
     
-    def process_message(self, message: Dict) -> Optional[str]:
+    async def process_message(self, message: IncomingMessage) -> Optional[str]:
         """Обработать входящее сообщение"""
         try:
-            chat_id = message['chat']['id']
-            user_id = message['from']['id']
-            text = message.get('text', '').strip()
+            chat_id = message.chat_id
+            user_id = message.user_id
+            text = message.text
             
             if not text:
                 return None
@@ -241,11 +367,11 @@ class ITMOCurriculumBot:
             
             # Команды бота
             if text.startswith('/start'):
-                self.send_telegram_message(chat_id, SYSTEM_PROMPTS['welcome'])
+                await self.send_telegram_message(chat_id, SYSTEM_PROMPTS['welcome'])
                 return "start_command_processed"
             
             elif text.startswith('/help'):
-                self.send_telegram_message(chat_id, SYSTEM_PROMPTS['help'])
+                await self.send_telegram_message(chat_id, SYSTEM_PROMPTS['help'])
                 return "help_command_processed"
             
             # Обычный вопрос - отправляем в YandexGPT
@@ -270,26 +396,27 @@ class ITMOCurriculumBot:
             try:
                 if message_id is None:
                     # Отправляем первое сообщение
-                    url = f'https://api.telegram.org/bot{self.telegram_token}/sendMessage'
+                    url = f'{self._base_url}/sendMessage'
                     payload = {
                         'chat_id': chat_id,
                         'text': msg,
                         'parse_mode': 'HTML'
                     }
-                    response = requests.post(url, data=payload, timeout=10)
-                    result = response.json()
+                    async with self.http.post(url, data=payload, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                        result = orjson.loads(await response.read())
                     if result.get('ok'):
                         message_id = result['result']['message_id']
                 else:
                     # Редактируем существующее сообщение
-                    url = f'https://api.telegram.org/bot{self.telegram_token}/editMessageText'
+                    url = f'{self._base_url}/editMessageText'
                     payload = {
                         'chat_id': chat_id,
                         'message_id': message_id,
                         'text': msg,
                         'parse_mode': 'HTML'
                     }
-                    requests.post(url, data=payload, timeout=10)
+                    async with self.http.post(url, data=payload, timeout=aiohttp.ClientTimeout(total=10)):
+                        pass
                 
                 # Пауза между сообщениями
                 if i < len(thinking_messages) - 1:
@@ -306,8 +433,9 @@ class ITMOCurriculumBot:
         thinking_message_id = None
         try:
             # Отправляем индикатор "печатает"
-            typing_url = f'https://api.telegram.org/bot{self.telegram_token}/sendChatAction'
-            requests.post(typing_url, data={'chat_id': chat_id, 'action': 'typing'})
+            typing_url = f'{self._base_url}/sendChatAction'
+            async with self.http.post(typing_url, data={'chat_id': chat_id, 'action': 'typing'}):
+                pass
             
             # Показываем анимацию обдумывания
             thinking_message_id = await self.show_thinking_animation(chat_id)
@@ -318,16 +446,17 @@ class ITMOCurriculumBot:
             # Удаляем сообщение с анимацией
             if thinking_message_id:
                 try:
-                    delete_url = f'https://api.telegram.org/bot{self.telegram_token}/deleteMessage'
-                    requests.post(delete_url, data={
+                    delete_url = f'{self._base_url}/deleteMessage'
+                    async with self.http.post(delete_url, data={
                         'chat_id': chat_id,
                         'message_id': thinking_message_id
-                    }, timeout=5)
+                    }, timeout=aiohttp.ClientTimeout(total=5)):
+                        pass
                 except Exception as e:
                     logger.warning(f"Could not delete thinking message: {e}")
             
             # Отправляем ответ пользователю
-            self.send_telegram_message(chat_id, response)
+            await self.send_telegram_message(chat_id, response)
             
             logger.info(f"Successfully handled question for chat {chat_id}")
             
@@ -337,47 +466,146 @@ class ITMOCurriculumBot:
             # Удаляем сообщение с анимацией в случае ошибки
             if thinking_message_id:
                 try:
-                    delete_url = f'https://api.telegram.org/bot{self.telegram_token}/deleteMessage'
-                    requests.post(delete_url, data={
+                    delete_url = f'{self._base_url}/deleteMessage'
+                    async with self.http.post(delete_url, data={
                         'chat_id': chat_id,
                         'message_id': thinking_message_id
-                    }, timeout=5)
+                    }, timeout=aiohttp.ClientTimeout(total=5)):
+                        pass
                 except:
                     pass
             
             error_message = "Извините, произошла ошибка при обработке вашего вопроса. Попробуйте позже."
-            self.send_telegram_message(chat_id, error_message)
+            await self.send_telegram_message(chat_id, error_message)
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Запустить корутину в фоне, сохранив ссылку на задачу"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+    
+    def _open_http_session(self):
+        """Создать HTTP-сессию для Telegram API"""
+        self.http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=16))
+    
+    async def _shutdown(self):
+        """Отменить фоновые задачи и закрыть HTTP-сессию"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.http is not None:
+            await self.http.close()
+    
+    async def handle_update(self, update: Dict):
+        """Обработать одно обновление Telegram"""
+        if 'message' in update:
+            try:
+                message = IncomingMessage.from_message(update['message'])
+            except (KeyError, TypeError) as e:
+                logger.error(f"Malformed message in update {update.get('update_id')}: {e}")
+                return
+            
+            # Обрабатываем сообщение
+            question = await self.process_message(message)
+            
+            if question and question not in ['start_command_processed', 'help_command_processed']:
+                # Обрабатываем вопрос в фоне, не задерживая получение обновлений
+                self._spawn(self.handle_question(message.chat_id, question))
+    
+    async def call_telegram_method(self, method: str, payload: Dict) -> bool:
+        """Вызвать метод Telegram API и вернуть признак успеха"""
+        url = f'{self._base_url}/{method}'
+        try:
+            async with self.http.post(url, data=payload, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                result = orjson.loads(await response.read())
+            if result.get('ok'):
+                return True
+            logger.error(f"Telegram method {method} failed: {result}")
+            return False
+        except Exception as e:
+            logger.error(f"Error calling Telegram method {method}: {e}")
+            return False
     
     async def run(self):
         """Запустить бота"""
         logger.info("Starting ITMO Curriculum Bot...")
         
-        while True:
-            try:
-                # Получаем обновления
-                updates = self.get_telegram_updates()
-                
-                for update in updates:
-                    if 'message' in update:
-                        message = update['message']
-                        chat_id = message['chat']['id']
-                        
-                        # Обрабатываем сообщение
-                        question = self.process_message(message)
-                        
-                        if question and question not in ['start_command_processed', 'help_command_processed']:
-                            # Обрабатываем вопрос асинхронно
-                            await self.handle_question(chat_id, question)
-                
-                # Небольшая пауза между запросами
-                await asyncio.sleep(1)
-                
-            except KeyboardInterrupt:
-                logger.info("Bot stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                await asyncio.sleep(5)  # Пауза при ошибке
+        self._open_http_session()
+        try:
+            # getUpdates не работает, пока у бота установлен webhook
+            await self.call_telegram_method('deleteWebhook', {})
+            
+            retry_delay = BOT_CONFIG['retry_delay']
+            while True:
+                try:
+                    # Получаем обновления (long polling сам ждет новых сообщений,
+                    # поэтому пауза нужна только после ошибки)
+                    updates = await self.get_telegram_updates()
+                    
+                    if updates is None:
+                        await asyncio.sleep(retry_delay)
+                        retry_delay = min(retry_delay * 2, BOT_CONFIG['max_retry_delay'])
+                        continue
+                    retry_delay = BOT_CONFIG['retry_delay']
+                    
+                    for update in updates:
+                        await self.handle_update(update)
+                    
+                except KeyboardInterrupt:
+                    logger.info("Bot stopped by user")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in main loop: {e}")
+                    await asyncio.sleep(5)  # Пауза при ошибке
+        finally:
+            await self._shutdown()
+    
+    async def _webhook_handler(self, request: web.Request) -> web.Response:
+        """Принять обновление от Telegram через webhook"""
+        secret = TELEGRAM_CONFIG['webhook_secret']
+        if secret and request.headers.get('X-Telegram-Bot-Api-Secret-Token') != secret:
+            return web.Response(status=403)
+        
+        try:
+            update = orjson.loads(await request.read())
+        except Exception as e:
+            logger.error(f"Error decoding webhook update: {e}")
+            return web.Response(status=400)
+        
+        # Отвечаем Telegram сразу, обработка идет в фоне
+        self._spawn(self.handle_update(update))
+        return web.Response()
+    
+    async def run_webhook(self):
+        """Запустить бота в режиме webhook"""
+        logger.info("Starting ITMO Curriculum Bot in webhook mode...")
+        
+        webhook_url = TELEGRAM_CONFIG['webhook_url']
+        app = web.Application()
+        app.router.add_post(urlparse(webhook_url).path or '/', self._webhook_handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        
+        self._open_http_session()
+        try:
+            # Сначала начинаем слушать порт, затем регистрируем webhook,
+            # чтобы Telegram не доставлял обновления в пустоту
+            site = web.TCPSite(runner, TELEGRAM_CONFIG['webhook_host'], TELEGRAM_CONFIG['webhook_port'])
+            await site.start()
+            logger.info(f"Listening for webhook updates on {TELEGRAM_CONFIG['webhook_host']}:{TELEGRAM_CONFIG['webhook_port']}")
+            
+            payload = {'url': webhook_url}
+            if TELEGRAM_CONFIG['webhook_secret']:
+                payload['secret_token'] = TELEGRAM_CONFIG['webhook_secret']
+            if not await self.call_telegram_method('setWebhook', payload):
+                raise RuntimeError("Failed to set Telegram webhook")
+            
+            # Работаем до остановки процесса
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+            await self._shutdown()
 
 def main():
     """Главная функция"""
@@ -386,7 +614,10 @@ def main():
         bot = ITMOCurriculumBot()
         
         # Запускаем бота
-        asyncio.run(bot.run())
+        if TELEGRAM_CONFIG['use_webhook']:
+            asyncio.run(bot.run_webhook())
+        else:
+            asyncio.run(bot.run())
     except Exception as e:
         logger.error(f"Failed to start bot: {e}")
         raise